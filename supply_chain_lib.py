@@ -0,0 +1,164 @@
+# 📦 Supply Chain Dashboard - shared data and chart layer
+# Cached loading, filtering, aggregation and chart builders used by the dashboard pages.
+
+import io
+
+import streamlit as st
+import numpy as np
+import pandas as pd
+import seaborn as sns
+import plotly.express as px
+import plotly.graph_objects as go
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+# --- Load Data ---
+FILTER_COLS = ['product_type', 'supplier_name', 'location', 'transportation_modes']
+CAT_COLS = FILTER_COLS + ['shipping_carriers', 'routes', 'inspection_results']
+
+# load_data and get_filtered return shared frames (cache_resource, not
+# cache_data) so cache hits do not copy them; callers only read them.
+@st.cache_resource
+def load_data():
+    # Low-cardinality string columns are parsed straight into category dtype.
+    data = pd.read_csv("cleaned_supply_chain1.csv", engine='pyarrow', dtype={c: 'category' for c in CAT_COLS})
+    data.columns = data.columns.str.strip().str.lower().str.replace(' ', '_')
+    uniques = {col: data[col].unique().tolist() for col in FILTER_COLS}
+    return data, uniques
+
+def make_filter_key(product_type, supplier, location, transport_mode):
+    # Cached helpers take this small tuple, never a DataFrame, so Streamlit
+    # hashes the selections instead of the frame's contents. Empty and
+    # all-selected filters both keep every row, so both map to ().
+    _, uniques = load_data()
+    selections = zip(FILTER_COLS, (product_type, supplier, location, transport_mode))
+    return tuple(
+        tuple(sorted(sel)) if len(sel) < len(uniques[col]) else ()
+        for col, sel in selections
+    )
+
+# Per-filter caches are bounded so memory does not grow with every combination.
+@st.cache_resource(max_entries=64)
+def get_filtered(filter_key):
+    product_type, supplier, location, transport_mode = filter_key
+    data, _ = load_data()
+    selections = {
+        'product_type': product_type,
+        'supplier_name': supplier,
+        'location': location,
+        'transportation_modes': transport_mode,
+    }
+    # make_filter_key maps empty and all-selected filters to (); skip their isin scans.
+    masks = [data[col].isin(sel) for col, sel in selections.items() if sel]
+    if not masks:
+        return data
+    return data.loc[np.logical_and.reduce(masks)]
+
+@st.cache_data(max_entries=256)
+def group_agg(filter_key, by, col, func):
+    df = get_filtered(filter_key)
+    return df.groupby(by, observed=True, sort=False)[col].agg(func).reset_index()
+
+@st.cache_data(max_entries=64)
+def compute_kpis(filter_key):
+    kpis = get_filtered(filter_key).agg({
+        'revenue_generated': 'sum',
+        'lead_time': 'mean',
+        'production_volumes': 'sum',
+        'defect_rates': 'mean',
+    })
+    return dict(
+        total_revenue=kpis['revenue_generated'],
+        avg_lead_time=kpis['lead_time'],
+        total_production=kpis['production_volumes'],
+        avg_defect_rate=kpis['defect_rates'],
+    )
+
+@st.cache_data(max_entries=64)
+def compute_insights(filter_key):
+    location_revenue = group_agg(filter_key, 'location', 'revenue_generated', 'sum').set_index('location')['revenue_generated']
+    supplier_costs = group_agg(filter_key, 'supplier_name', 'manufacturing_costs', 'mean').set_index('supplier_name')['manufacturing_costs']
+    mode_costs = group_agg(filter_key, 'transportation_modes', 'costs', 'mean').set_index('transportation_modes')['costs']
+    return dict(
+        top_location_revenue=location_revenue.idxmax(),
+        highest_cost_supplier=supplier_costs.idxmax(),
+        most_efficient_mode=mode_costs.idxmin(),  # Proxy for sustainability
+    )
+
+@st.cache_data(max_entries=64)
+def ship_hist(filter_key, bins=30):
+    # Stacked per-carrier histogram counts on a shared set of bin edges.
+    df = get_filtered(filter_key)
+    edges = np.histogram_bin_edges(df['shipping_costs'], bins=bins)
+    centers = (edges[:-1] + edges[1:]) / 2
+    rows = []
+    for carrier, group in df.groupby('shipping_carriers', observed=True, sort=False):
+        counts, _ = np.histogram(group['shipping_costs'], bins=edges)
+        rows.append(pd.DataFrame({'shipping_costs': centers, 'count': counts, 'shipping_carriers': carrier}))
+    return pd.concat(rows, ignore_index=True)
+
+@st.cache_data(max_entries=64)
+def route_freq(filter_key):
+    counts = get_filtered(filter_key)['routes'].value_counts()
+    # Categorical value_counts also lists unobserved routes; drop those.
+    counts = counts[counts > 0]
+    return counts.rename_axis('Route').reset_index(name='Frequency')
+
+@st.cache_data(max_entries=16)
+def to_csv_bytes(filter_key):
+    return get_filtered(filter_key).to_csv(index=False).encode('utf-8')
+
+def figure_png(fig):
+    # Render a pyplot-free Figure straight to PNG bytes for st.image.
+    buf = io.BytesIO()
+    FigureCanvasAgg(fig).print_png(buf)
+    return buf.getvalue()
+
+# --- Chart Builders ---
+# One cached builder per dashboard section: Plotly figures are returned as
+# objects (cache_data pickles them), matplotlib charts as PNG bytes.
+@st.cache_data(max_entries=32)
+def production_charts(filter_key):
+    df = get_filtered(filter_key)
+    fig1 = px.scatter(df, x='production_volumes', y='stock_levels', size='lead_time', color='product_type', render_mode='webgl', color_discrete_sequence=sns.color_palette('coolwarm', df['product_type'].nunique()).as_hex(), title="Relationship: Production Volume vs Stock Levels (Size: Lead Time)")
+    fig2 = px.scatter(df, x='production_volumes', y='stock_levels', size='order_quantities', color='product_type', render_mode='webgl', color_discrete_sequence=px.colors.qualitative.Set1, title="Production Volume vs Stock Levels (Size: Order Quantities)")
+    return fig1, fig2
+
+@st.cache_data(max_entries=32)
+def revenue_charts(filter_key):
+    df = get_filtered(filter_key)
+    revenue = group_agg(filter_key, 'location', 'revenue_generated', 'sum')
+    fig3 = px.bar(revenue, x='location', y='revenue_generated', color='location', color_discrete_sequence=sns.color_palette('viridis', len(revenue)).as_hex(), title="Total Revenue by Location")
+    costs = group_agg(filter_key, 'supplier_name', 'manufacturing_costs', 'mean')
+    fig4 = px.bar(costs, x='supplier_name', y='manufacturing_costs', color='supplier_name', color_discrete_sequence=sns.color_palette('pastel', len(costs)).as_hex(), title="Average Manufacturing Costs by Supplier")
+    fig5 = go.Figure()
+    for col, color in zip(('price', 'manufacturing_costs'), sns.color_palette('tab10').as_hex()):
+        fig5.add_box(x=df['product_type'], y=df[col], name=col, marker_color=color)
+    fig5.update_layout(boxmode='group', title="Price vs Manufacturing Costs by Product Type", xaxis_title='product_type', yaxis_title='Amount', legend_title_text='Cost Type')
+    lead_times = group_agg(filter_key, 'product_type', 'lead_time', 'mean')
+    fig6 = px.bar(lead_times, x='product_type', y='lead_time', color='product_type', color_discrete_sequence=sns.color_palette('Blues', len(lead_times)).as_hex(), title="Average Lead Time by Product Type")
+    # Colours only distinguish the bars, as seaborn's palettes did; no legend needed.
+    for fig in (fig3, fig4, fig6):
+        fig.update_layout(showlegend=False)
+    return fig3, fig4, fig5, fig6
+
+@st.cache_data(max_entries=32)
+def shipping_charts(filter_key):
+    fig7 = px.bar(ship_hist(filter_key), x='shipping_costs', y='count', color='shipping_carriers', barmode='stack', color_discrete_sequence=px.colors.qualitative.Set2, title="Shipping Costs Distribution by Carrier")
+    fig7.update_layout(bargap=0)
+    fig8 = px.bar(route_freq(filter_key), x='Route', y='Frequency', title="Frequency of Transportation Routes", color='Frequency', color_continuous_scale='Reds')
+    return fig7, fig8
+
+@st.cache_data(max_entries=32)
+def risk_charts(filter_key):
+    df = get_filtered(filter_key)
+    fig9 = Figure(figsize=(10,6))
+    ax9 = fig9.subplots()
+    # Categorical x would draw empty slots for filtered-out results; plot observed ones only.
+    sns.boxplot(x='inspection_results', y='defect_rates', data=df, order=df['inspection_results'].unique().tolist(), palette='coolwarm', ax=ax9)
+    ax9.set_title("Defect Rates by Inspection Results (Risk Proxy)")
+    mode_costs = group_agg(filter_key, 'transportation_modes', 'costs', 'mean')
+    fig10 = px.bar(mode_costs, x='transportation_modes', y='costs', color='transportation_modes', color_discrete_sequence=sns.color_palette('Greens', len(mode_costs)).as_hex(), title="Average Costs by Transportation Mode (Lower = More Sustainable)")
+    fig11 = px.scatter(df, x='manufacturing_costs', y='profit_margin', color='product_type', render_mode='webgl', color_discrete_sequence=sns.color_palette('tab20').as_hex(), title="Profit Margin vs Manufacturing Costs (Efficiency Indicator)")
+    fig10.update_layout(showlegend=False)
+    return figure_png(fig9), fig10, fig11